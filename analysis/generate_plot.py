@@ -9,7 +9,7 @@ DataType = tuple[tuple[list[float], str], tuple[list[float], str]]
 
 
 def generate_data() -> DataType:
-    numbers = [qrandom.random() for _ in range(10000)]
+    numbers = qrandom.random_array(10000).tolist()
     py_numbers = [random.random() for _ in range(10000)]
     return (numbers, "Quantum random"), (py_numbers, "Python pseudo-random")
 
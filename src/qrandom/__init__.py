@@ -8,27 +8,45 @@ University (https://quantumnumbers.anu.edu.au/).
 You can use this module just like the standard random module. The module
 replaces the default Mersenne Twister generator. Seeding is ignored
 and getstate() and setstate() are not implemented because there is no state.
-Also, getrandbits() is not available so randrange() can't cover arbitrarily
-large ranges. There is no randbytes() because getrandbits() is not available.
+getrandbits() and randbytes() take their bits straight from the fetched
+quantum numbers, so randrange() can cover arbitrarily large ranges.
+
+The generator behind the module-level functions is created on first use, so
+importing qrandom neither needs an API key nor loads the HTTP stack.
 
 """
 
+import functools
 import sys
+from collections.abc import Callable
+from typing import Any
 
+from qrandom._api import Client, find_api_key
 from qrandom._generator import QuantumRandom
+from qrandom._retry import CircuitBreaker, RetryPolicy
+from qrandom._server import EntropyServer, SocketClient
+from qrandom._stretch import StretchedSource
 
 __all__ = [
+    "CircuitBreaker",
+    "Client",
+    "EntropyServer",
     "QuantumRandom",
+    "RetryPolicy",
+    "SocketClient",
+    "StretchedSource",
     "betavariate",
     "choice",
     "choices",
     "expovariate",
     "gammavariate",
     "gauss",
+    "getrandbits",
     "getstate",
     "lognormvariate",
     "normalvariate",
     "paretovariate",
+    "randbytes",
     "randint",
     "random",
     "randrange",
@@ -41,32 +59,63 @@ __all__ = [
     "vonmisesvariate",
     "weibullvariate",
     "fill",
+    "find_api_key",
+    "randint_array",
+    "random_array",
+    "uniform_array",
 ]
 
-_inst = QuantumRandom()
-betavariate = _inst.betavariate
+# Instance behind the module-level functions. It is created on the first call
+# to one of them, so importing qrandom does not look up the API key.
+_inst: QuantumRandom | None = None
+
+
+def _instance() -> QuantumRandom:
+    global _inst
+    if _inst is None:
+        _inst = QuantumRandom()
+    return _inst
+
+
+def _delegate(name: str) -> Callable[..., Any]:
+    method = getattr(QuantumRandom, name)
+
+    @functools.wraps(method)
+    def function(*args, **kwds):
+        return getattr(_instance(), name)(*args, **kwds)
+
+    del function.__wrapped__
+    return function
+
+
+betavariate = _delegate("betavariate")
 if (sys.version_info.major, sys.version_info.minor) >= (3, 12):
-    binomialvariate = _inst.binomialvariate
+    binomialvariate = _delegate("binomialvariate")
     __all__.append("binomialvariate")
-choice = _inst.choice
-choices = _inst.choices
-expovariate = _inst.expovariate
-gammavariate = _inst.gammavariate
-gauss = _inst.gauss
-getstate = _inst.getstate
-lognormvariate = _inst.lognormvariate
-normalvariate = _inst.normalvariate
-paretovariate = _inst.paretovariate
-randint = _inst.randint
-random = _inst.random
-randrange = _inst.randrange
-sample = _inst.sample
-seed = _inst.seed
-setstate = _inst.setstate
-shuffle = _inst.shuffle
-triangular = _inst.triangular
-uniform = _inst.uniform
-vonmisesvariate = _inst.vonmisesvariate
-weibullvariate = _inst.weibullvariate
-
-fill = _inst.fill
+choice = _delegate("choice")
+choices = _delegate("choices")
+expovariate = _delegate("expovariate")
+gammavariate = _delegate("gammavariate")
+gauss = _delegate("gauss")
+getrandbits = _delegate("getrandbits")
+getstate = _delegate("getstate")
+lognormvariate = _delegate("lognormvariate")
+normalvariate = _delegate("normalvariate")
+paretovariate = _delegate("paretovariate")
+randbytes = _delegate("randbytes")
+randint = _delegate("randint")
+random = _delegate("random")
+randrange = _delegate("randrange")
+sample = _delegate("sample")
+seed = _delegate("seed")
+setstate = _delegate("setstate")
+shuffle = _delegate("shuffle")
+triangular = _delegate("triangular")
+uniform = _delegate("uniform")
+vonmisesvariate = _delegate("vonmisesvariate")
+weibullvariate = _delegate("weibullvariate")
+
+fill = _delegate("fill")
+random_array = _delegate("random_array")
+randint_array = _delegate("randint_array")
+uniform_array = _delegate("uniform_array")
@@ -1,11 +1,29 @@
+import array
 import configparser
 import os
 import pathlib
-from typing import TypedDict
+import sys
+import threading
+import time
+from typing import TYPE_CHECKING, Literal, TypedDict, cast
 
-import requests
+from qrandom import _exceptions, _retry, _util
 
-from qrandom import _exceptions, _util
+if TYPE_CHECKING:
+    import concurrent.futures
+
+    import requests
+
+# Hedging delay used until enough latencies are known to estimate the p95
+_DEFAULT_HEDGE_AFTER = 1.0
+
+# Largest number of blocks per hex8/hex16 number that the API allows
+MAX_BLOCK_SIZE = 10
+
+DataType = Literal["uint8", "uint16", "hex8", "hex16"]
+
+# Bytes per number (and per block for the hex types)
+_DATA_TYPE_BYTES = {"uint8": 1, "uint16": 2, "hex8": 1, "hex16": 2}
 
 
 def find_api_key() -> str:
@@ -54,25 +72,131 @@ class Response(TypedDict):
     success: bool
     type: str
     length: str
-    data: list[str]
+    data: list[str] | list[int]
 
 
 class Client:
     url = "https://api.quantumnumbers.anu.edu.au"
 
-    def __init__(self, key: str, batch_size: int = 1024) -> None:
+    def __init__(
+        self,
+        key: str,
+        batch_size: int = 1024,
+        *,
+        data_type: DataType = "hex16",
+        block_size: int = MAX_BLOCK_SIZE,
+        timeout: float | tuple[float, float] | None = (5.0, 30.0),
+        pool_connections: int = 1,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        max_retries: int = 0,
+        max_in_flight: int = 4,
+        retry: _retry.RetryPolicy | None = None,
+        circuit_breaker: _retry.CircuitBreaker | None = None,
+        hedge: bool = False,
+        hedge_after: float | None = None,
+    ) -> None:
         """ANU API client.
 
         The API key can be obtained from https://quantumnumbers.anu.edu.au/pricing.
-        batch_size is the number of numbers fetched (1024 by default).
+        batch_size is the number of numbers fetched per API call (1024 by
+        default).
+
+        data_type and block_size select the API's number format. Each hex16
+        (hex8) number is block_size 16-bit (8-bit) blocks, up to
+        MAX_BLOCK_SIZE; uint8 and uint16 numbers are a single byte or two
+        (block_size is ignored). The default, hex16 with the largest blocks,
+        gets the most random bytes per billed call and per byte of JSON. The
+        bytes of a call are cut into 64-bit ints, and the batch_size
+        attribute is the resulting number of ints per batch (2560 by
+        default).
+
+        Requests go through a persistent session with keep-alive, so the
+        TCP and TLS handshakes are paid once per pooled connection rather than
+        once per batch. timeout is passed to every request (a number or a
+        (connect, read) tuple in seconds; None waits forever). pool_connections,
+        pool_maxsize, pool_block and max_retries configure the session's
+        HTTPAdapter. The client can be shared by several generators.
+
+        max_in_flight is the maximum number of concurrent requests made by
+        fetch_int64_batches (keep it at or below pool_maxsize).
+
+        retry decides which failed requests are retried and how long to back
+        off (default: RetryPolicy()). circuit_breaker makes calls fail fast
+        with CircuitOpenError while the API keeps failing (default:
+        CircuitBreaker()).
+
+        If hedge is True and a request has not answered within hedge_after
+        seconds, a second identical request is sent and whichever answers
+        first is used. By default, hedge_after is the 95th percentile of
+        recent request latencies. Hedged requests count against the API
+        quota.
 
         """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be > 0")
+        if data_type not in _DATA_TYPE_BYTES:
+            raise ValueError(f"unknown data_type {data_type!r}")
+        self.params: dict[str, int | str] = {"length": batch_size, "type": data_type}
+        bytes_per_number = _DATA_TYPE_BYTES[data_type]
+        if data_type.startswith("hex"):
+            if not (0 < block_size <= MAX_BLOCK_SIZE):
+                raise ValueError(f"block_size must be > 0 and up to {MAX_BLOCK_SIZE}")
+            self.params["size"] = block_size
+            bytes_per_number *= block_size
+        if batch_size * bytes_per_number < 8:
+            raise ValueError("a batch must hold at least one 64-bit int")
         self.key = key
-        self.params: dict[str, int | str] = {
-            "length": batch_size,
-            "type": "hex16",
-            "size": 4,
-        }
+        self.data_type = data_type
+        self.batch_size = batch_size * bytes_per_number // 8
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.max_retries = max_retries
+        self.retry = retry if retry is not None else _retry.RetryPolicy()
+        self.circuit_breaker = (
+            circuit_breaker if circuit_breaker is not None else _retry.CircuitBreaker()
+        )
+        self.hedge = hedge
+        self.hedge_after = hedge_after
+        self.latencies = _retry.LatencyTracker()
+        self._session: "requests.Session | None" = None
+        self._session_lock = threading.Lock()
+        self._hedge_executor: "concurrent.futures.ThreadPoolExecutor | None" = None
+        return
+
+    @property
+    def session(self) -> "requests.Session":
+        """The pooled HTTP session (created on first use)."""
+        with self._session_lock:
+            if self._session is None:
+                # Imported here to keep importing qrandom cheap
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=self.pool_connections,
+                    pool_maxsize=self.pool_maxsize,
+                    max_retries=self.max_retries,
+                    pool_block=self.pool_block,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session = session
+            return self._session
+
+    def close(self) -> None:
+        """Closes the pooled connections. The client remains usable."""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+            if self._hedge_executor is not None:
+                self._hedge_executor.shutdown(wait=False)
+                self._hedge_executor = None
         return
 
     def fetch_hex_raw(self) -> Response:
@@ -82,9 +206,79 @@ class Client:
         API call is not successful. This includes the case of
         batch_size > 1024.
 
+        Connection errors, timeouts and retryable statuses (see RetryPolicy)
+        are retried with jittered exponential backoff, waiting at least as
+        long as any Retry-After header asks. Raises CircuitOpenError without
+        calling the API while the circuit breaker is open.
+
         """
-        response = requests.get(
-            self.url, params=self.params, headers={"x-api-key": self.key}
+        import requests
+
+        attempt = 0
+        while True:
+            self.circuit_breaker.before_call()
+            retry_after = None
+            try:
+                r_json = self._get_hedged() if self.hedge else self._get()
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error: Exception = e
+            except requests.HTTPError as e:
+                if (
+                    e.response is None
+                    or e.response.status_code not in self.retry.statuses
+                ):
+                    # The API is up but rejected the request
+                    self.circuit_breaker.record_success()
+                    raise
+                error = e
+                retry_after = _retry.parse_retry_after(
+                    e.response.headers.get("Retry-After")
+                )
+            else:
+                self.circuit_breaker.record_success()
+                return r_json
+            self.circuit_breaker.record_failure()
+            attempt += 1
+            if attempt == self.retry.attempts:
+                raise error
+            time.sleep(self.retry.delay(attempt - 1, retry_after))
+
+    def _get_hedged(self) -> Response:
+        import concurrent.futures
+
+        with self._session_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=2 * self.max_in_flight,
+                    thread_name_prefix="qrandom-hedge",
+                )
+            executor = self._hedge_executor
+        hedge_after = self.hedge_after
+        if hedge_after is None:
+            hedge_after = self.latencies.percentile(95) or _DEFAULT_HEDGE_AFTER
+        first = executor.submit(self._get)
+        try:
+            return first.result(timeout=hedge_after)
+        except concurrent.futures.TimeoutError:
+            pass
+        futures = {first, executor.submit(self._get)}
+        while True:
+            done, futures = concurrent.futures.wait(
+                futures, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                if future.exception() is None or not futures:
+                    return future.result()
+
+    def _get(self) -> Response:
+        import requests
+
+        start = time.monotonic()
+        response = self.session.get(
+            self.url,
+            params=self.params,
+            headers={"x-api-key": self.key},
+            timeout=self.timeout,
         )
         try:
             response.raise_for_status()
@@ -103,21 +297,65 @@ class Client:
                 "the 'success' field in the ANU response was False even "
                 f"though the status code was {response.status_code}"
             )
+        self.latencies.record(time.monotonic() - start)
         return r_json
 
-    def fetch_hex(self) -> list[str]:
-        """Gets hexadecimal random numbers from the ANU API.
+    def fetch_hex(self) -> list[str] | list[int]:
+        """Gets random numbers from the ANU API.
 
         Calls Client.fetch_hex_raw(batch_size) and processes the response.
+        The numbers are hex strings for the hex data types and ints
+        otherwise.
 
         """
         return self.fetch_hex_raw()["data"]
 
-    def fetch_int64(self) -> list[int]:
+    def fetch_bytes(self) -> bytes:
+        """Gets a batch of random bytes from the ANU API.
+
+        Decodes the numbers from Client.fetch_hex() in one pass, taking
+        uint16 numbers as big-endian like the hex ones.
+
+        """
+        data = self.fetch_hex()
+        if self.data_type == "uint8":
+            return bytes(cast("list[int]", data))
+        if self.data_type == "uint16":
+            numbers = array.array("H", cast("list[int]", data))
+            if sys.byteorder == "little":
+                numbers.byteswap()
+            return numbers.tobytes()
+        return bytes.fromhex("".join(cast("list[str]", data)))
+
+    def fetch_int64(self) -> "array.array[int]":
         """Gets random int64s from the ANU API.
 
-        Calls Client.fetch_hex(batch_size) and converts the hex numbers to
-        ints.
+        Calls Client.fetch_bytes() and reads the bytes as big-endian unsigned
+        64-bit ints. Bytes left over after the last whole int are dropped.
+
+        """
+        data = self.fetch_bytes()
+        numbers = array.array("Q", data[: len(data) // 8 * 8])
+        if sys.byteorder == "little":
+            # The hex numbers are big-endian
+            numbers.byteswap()
+        return numbers
+
+    def fetch_int64_batches(self, n: int) -> "list[array.array[int]]":
+        """Gets n batches of random int64s from the ANU API.
+
+        Up to max_in_flight requests are made concurrently. The batches are
+        returned in request order. If any request fails, its exception is
+        raised once the requests in flight have finished.
 
         """
-        return [int(number, 16) for number in self.fetch_hex()]
+        if n == 1 or self.max_in_flight == 1:
+            return [self.fetch_int64() for _ in range(n)]
+        import concurrent.futures
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(n, self.max_in_flight),
+            thread_name_prefix="qrandom-fetch",
+        ) as executor:
+            futures = [executor.submit(self.fetch_int64) for _ in range(n)]
+            return [future.result() for future in futures]
@@ -0,0 +1,81 @@
+import array
+from collections.abc import Iterable, Iterator
+
+
+class EntropyBuffer:
+    """Compact first-in, first-out buffer of random 64-bit ints.
+
+    The numbers are stored contiguously in an array of unsigned 64-bit ints
+    (8 bytes per number) and consumed through a read cursor, so taking
+    numbers never moves the rest of the buffer. Consumed numbers are
+    discarded when the buffer is next extended.
+
+    """
+
+    def __init__(self) -> None:
+        self._words = array.array("Q")
+        self._pos = 0
+        return
+
+    def __len__(self) -> int:
+        return len(self._words) - self._pos
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._words[self._pos :])
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes used to store the numbers left in the buffer."""
+        return len(self) * self._words.itemsize
+
+    def extend(self, words: Iterable[int]) -> None:
+        """Appends numbers to the end of the buffer."""
+        if self._pos:
+            del self._words[: self._pos]
+            self._pos = 0
+        if isinstance(words, array.array):
+            self._words.extend(words)
+        else:
+            self._words.extend(array.array("Q", words))
+        return
+
+    def pop(self) -> int:
+        """Removes and returns the oldest number. Raises IndexError if empty."""
+        try:
+            word = self._words[self._pos]
+        except IndexError:
+            raise IndexError("pop from empty buffer") from None
+        self._pos += 1
+        return word
+
+    def take(self, n: int) -> "array.array[int]":
+        """Removes and returns the n oldest numbers.
+
+        Raises IndexError if the buffer holds fewer than n numbers.
+
+        """
+        if not (0 <= n <= len(self)):
+            raise IndexError("not enough numbers in buffer")
+        words = self._words[self._pos : self._pos + n]
+        self._pos += n
+        return words
+
+    def readinto(self, dest: memoryview) -> int:
+        """Copies the oldest bytes into dest and removes them from the buffer.
+
+        dest must be a writable memoryview with format "B". The bytes are
+        copied straight from the buffer's storage. Returns the number of bytes
+        copied (the size of dest or of the buffer, whichever is smaller). A
+        partially copied number is removed from the buffer.
+
+        """
+        nbytes = min(len(dest), self.nbytes)
+        start = self._pos * self._words.itemsize
+        with (
+            memoryview(self._words) as words,
+            words.cast("B") as src,
+            src[start : start + nbytes] as chunk,
+        ):
+            dest[:nbytes] = chunk
+        self._pos += -(-nbytes // self._words.itemsize)
+        return nbytes
@@ -1,12 +1,14 @@
 import configparser
 import os
 import pathlib
+from typing import Annotated
 
 import typer
 
-from qrandom import _util
+from qrandom import _api, _generator, _server, _util
 
 app = typer.Typer()
+cli = typer.Typer()
 
 
 @app.command()
@@ -53,3 +55,46 @@ def main():
             "Since you did not write to the default path, "
             f"do not forget to set QRANDOM_CONFIG_DIR to {config_dir}."
         )
+
+
+@cli.callback()
+def qrandom() -> None:
+    """Quantum random numbers from ANU Quantum Numbers."""
+
+
+@cli.command()
+def serve(
+    address: Annotated[
+        str,
+        typer.Option(help="Address to listen on: unix:PATH or HOST:PORT."),
+    ],
+    pool_size: Annotated[
+        int,
+        typer.Option(help="Number of 64-bit ints to keep in the pool."),
+    ] = 65536,
+    cache: Annotated[
+        pathlib.Path | None,
+        typer.Option(help="On-disk entropy pool to draw from first."),
+    ] = None,
+) -> None:
+    """Serve pooled quantum random bytes over a Unix or TCP socket.
+
+    Point workers at the server by setting QRANDOM_SERVER to the same address
+    (or by passing a SocketClient to QuantumRandom or quantum_rng).
+
+    """
+    generator = _generator.QuantumRandom(
+        client=_api.Client(_api.find_api_key()),
+        cache=cache,
+        prefetch=True,
+        low_watermark=max(1, pool_size // 4),
+        high_watermark=max(2, pool_size),
+    )
+    server = _server.EntropyServer(_server.parse_address(address), generator)
+    typer.echo(f"Serving quantum random bytes on {address}.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
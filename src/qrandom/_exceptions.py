@@ -1,2 +1,10 @@
 class APIKeyNotFoundError(Exception):
     pass
+
+
+class EntropyServerError(Exception):
+    pass
+
+
+class CircuitOpenError(Exception):
+    pass
@@ -1,48 +1,339 @@
+import array
+import os
 import random as pyrandom
+import threading
 import warnings
-from typing import NoReturn
+from typing import TYPE_CHECKING, NoReturn
 
-from qrandom import _api
+from qrandom import _api, _buffer, _pool, _server, _source, _stretch, _util
+
+if TYPE_CHECKING:
+    import numpy as np
+    from typing_extensions import Buffer
 
 
 class QuantumRandom(pyrandom.Random):
     """Quantum random number generator."""
 
-    def __init__(self, batch_size: int = 1024):
+    def __init__(
+        self,
+        batch_size: int = 1024,
+        *,
+        client: _source.Source | None = None,
+        cache: str | os.PathLike[str] | None = None,
+        prefetch: bool = False,
+        low_watermark: int | None = None,
+        high_watermark: int | None = None,
+        stretch: int | None = None,
+    ):
         """Initialises an instance of QuantumRandom.
 
         batch_size is the number of ANU random numbers fetched and cached
         per API call (default is maximum allowed: 1024).
 
+        client is the ANU API client (or other source, such as a SocketClient
+        for an entropy server) to fetch with. Generators built on the same
+        client share its pooled HTTP session. If not given, a SocketClient is
+        created if $QRANDOM_SERVER is set (unix:PATH or HOST:PORT), and an ANU
+        API client with the key from find_api_key() otherwise. batch_size is
+        passed to the new client (and ignored if client is given).
+
+        cache is the path to an on-disk entropy pool (default: $QRANDOM_CACHE
+        if set). Batches are taken from the pool first and, when it runs dry,
+        fetched from the API in bulk, with the surplus added to the pool. The
+        pool can be shared between processes and runs; no number is ever taken
+        from it twice.
+
+        If prefetch is True, a background thread refills the cache whenever it
+        holds fewer than low_watermark numbers (default: batch_size) and keeps
+        fetching until it holds at least high_watermark numbers (default:
+        4 * batch_size). Call close() to stop the thread.
+
+        If stretch is given, fetched quantum numbers are not used directly but
+        seed a SHAKE-256 generator that produces stretch numbers for each
+        quantum one (see StretchedSource). This lifts the API quota and HTTP
+        limits on throughput at the cost of quantum purity.
+
         """
         with warnings.catch_warnings():
             warnings.simplefilter("ignore", category=UserWarning)
             super().__init__()
-        self._rand_int64: list[int] = []
+        self._rand_int64 = _buffer.EntropyBuffer()
         if not (0 < batch_size <= 1024):
             raise ValueError("batch_size must be > 0 and up to 1024")
-        self._api_client = _api.Client(_api.find_api_key(), batch_size=batch_size)
+        if low_watermark is None:
+            low_watermark = batch_size
+        if high_watermark is None:
+            high_watermark = 4 * batch_size
+        if not (0 < low_watermark < high_watermark):
+            raise ValueError(
+                "watermarks must satisfy 0 < low_watermark < high_watermark"
+            )
+        self._low_watermark = low_watermark
+        self._high_watermark = high_watermark
+        if client is None:
+            server = os.getenv("QRANDOM_SERVER")
+            if server is not None:
+                client = _server.SocketClient(
+                    _server.parse_address(server), batch_size=batch_size
+                )
+            else:
+                client = _api.Client(_api.find_api_key(), batch_size=batch_size)
+        self._api_client = client
+        if cache is None:
+            cache = os.getenv("QRANDOM_CACHE")
+        self._source: _source.Source = client
+        if cache is not None:
+            self._source = _pool.PooledClient(client, _pool.EntropyPool(cache))
+        if stretch is not None:
+            self._source = _stretch.StretchedSource(self._source, stretch)
+        self._cond = threading.Condition()
+        self._prefetch_error: Exception | None = None
+        self._prefetch_thread: threading.Thread | None = None
+        self._closed = False
+        if prefetch:
+            self._prefetch_thread = threading.Thread(
+                target=self._prefetch, name="qrandom-prefetch", daemon=True
+            )
+            self._prefetch_thread.start()
         return
 
     def fill(self, n: int = 1):
         """Fills the generator with n batches of 64-bit ints.
 
-        The batch size is set during initialisation.
+        The batch size is set during initialisation. Batches are fetched
+        concurrently (up to the client's max_in_flight at a time) and added
+        in request order.
+
+        """
+        batches = self._source.fetch_int64_batches(n)
+        with self._cond:
+            for numbers in batches:
+                self._rand_int64.extend(numbers)
+            self._cond.notify_all()
+        return
+
+    def close(self) -> None:
+        """Stops the prefetch thread (if any). Cached numbers remain usable."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._prefetch_thread is not None:
+            self._prefetch_thread.join()
+            self._prefetch_thread = None
+        return
+
+    def _prefetch(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed and (
+                    len(self._rand_int64) >= self._low_watermark
+                    or self._prefetch_error is not None
+                ):
+                    self._cond.wait()
+                if self._closed:
+                    return
+                missing = self._high_watermark - len(self._rand_int64)
+            try:
+                batches = self._source.fetch_int64_batches(
+                    -(-missing // self._source.batch_size)
+                )
+            except Exception as e:
+                # Handed over to the next caller that finds the cache empty
+                with self._cond:
+                    self._prefetch_error = e
+                    self._cond.notify_all()
+                continue
+            with self._cond:
+                for numbers in batches:
+                    self._rand_int64.extend(numbers)
+                self._cond.notify_all()
+
+    def _refill(self, missing: int) -> None:
+        """Blocks until the cache is not empty.
+
+        Waits for the prefetch thread if it is running. Otherwise, fetches
+        enough batches for the missing number of 64-bit ints.
 
         """
-        for _ in range(n):
-            self._rand_int64.extend(self._api_client.fetch_int64())
+        with self._cond:
+            while (
+                self._prefetch_thread is not None
+                and not self._closed
+                and not self._rand_int64
+            ):
+                if self._prefetch_error is not None:
+                    error, self._prefetch_error = self._prefetch_error, None
+                    self._cond.notify_all()
+                    raise error
+                self._cond.notify_all()
+                self._cond.wait()
+            if self._rand_int64:
+                return
+        self.fill(-(-missing // self._source.batch_size))
+        return
+
+    def _consumed(self) -> None:
+        # Must be called with self._cond held
+        if (
+            self._prefetch_thread is not None
+            and len(self._rand_int64) < self._low_watermark
+        ):
+            self._cond.notify_all()
         return
 
     def _get_rand_int64(self) -> int:
-        if not self._rand_int64:
-            self.fill()
-        return self._rand_int64.pop()
+        if self._prefetch_thread is None:
+            if not self._rand_int64:
+                self.fill()
+            return self._rand_int64.pop()
+        while True:
+            with self._cond:
+                if self._rand_int64:
+                    number = self._rand_int64.pop()
+                    self._consumed()
+                    return number
+            self._refill(1)
+
+    def _take_int64(self, n: int) -> "array.array[int]":
+        numbers = array.array("Q")
+        while len(numbers) < n:
+            with self._cond:
+                if self._rand_int64:
+                    numbers.extend(
+                        self._rand_int64.take(
+                            min(n - len(numbers), len(self._rand_int64))
+                        )
+                    )
+                    self._consumed()
+                    continue
+            self._refill(n - len(numbers))
+        return numbers
 
     def random(self) -> float:
         """Gets the next quantum random number in the range [0.0, 1.0)."""
         return self._get_rand_int64() / (2**64)
 
+    def getrandbits(self, k: int) -> int:
+        """Gets a quantum random int with k random bits.
+
+        Uses ceil(k / 64) numbers from the cache.
+
+        """
+        if k < 0:
+            raise ValueError("number of bits must be non-negative")
+        if k == 0:
+            return 0
+        if k <= 64:
+            return self._get_rand_int64() >> (64 - k)
+        n = -(-k // 64)
+        return int.from_bytes(self._take_int64(n).tobytes(), "little") >> (64 * n - k)
+
+    def readinto(self, buffer: "Buffer") -> int:
+        """Fills a writable bytes-like object with quantum random bytes.
+
+        The bytes are copied straight from the cache into buffer without
+        intermediate objects. Returns the number of bytes written.
+
+        """
+        with memoryview(buffer) as view, view.cast("B") as dest:
+            total = len(dest)
+            offset = 0
+            while offset < total:
+                with self._cond:
+                    if self._rand_int64:
+                        with dest[offset:] as rest:
+                            offset += self._rand_int64.readinto(rest)
+                        self._consumed()
+                        continue
+                self._refill(-(-(total - offset) // 8))
+        return total
+
+    def randbytes(self, n: int) -> bytes:
+        """Gets n quantum random bytes."""
+        if n < 0:
+            raise ValueError("number of bytes must be non-negative")
+        data = bytearray(n)
+        self.readinto(data)
+        return bytes(data)
+
+    def random_array(self, n: int) -> "np.ndarray | array.array[float]":
+        """Gets n quantum random floats in the range [0.0, 1.0).
+
+        The floats are converted in bulk from the next n cached numbers (53
+        bits each). Returns a numpy float64 array if numpy is installed and an
+        array.array("d") otherwise.
+
+        """
+        if n < 0:
+            raise ValueError("n must be non-negative")
+        numpy = _util.optional_numpy()
+        if numpy is not None:
+            words = numpy.empty(n, dtype=numpy.uint64)
+            self.readinto(words)
+            return (words >> 11) * (1.0 / 2**53)
+        return array.array(
+            "d", [(word >> 11) * (1.0 / 2**53) for word in self._take_int64(n)]
+        )
+
+    def uniform_array(
+        self, a: float, b: float, n: int
+    ) -> "np.ndarray | array.array[float]":
+        """Gets n quantum random floats between a and b (see uniform())."""
+        numbers = self.random_array(n)
+        if isinstance(numbers, array.array):
+            return array.array("d", [a + (b - a) * x for x in numbers])
+        return a + (b - a) * numbers
+
+    def randint_array(self, a: int, b: int, n: int) -> "np.ndarray | array.array[int]":
+        """Gets n quantum random ints in the range [a, b], endpoints included.
+
+        a and b must fit in a signed 64-bit int. Each int takes the top bits
+        of a cached number, with rejection so that every value is equally
+        likely. Returns a numpy int64 array if numpy is installed and an
+        array.array("q") otherwise.
+
+        """
+        if n < 0:
+            raise ValueError("n must be non-negative")
+        if not (-(2**63) <= a <= b < 2**63):
+            raise ValueError("a and b must satisfy -2**63 <= a <= b < 2**63")
+        span = b - a + 1
+        shift = 64 - (span - 1).bit_length()
+        numpy = _util.optional_numpy()
+        if numpy is not None:
+            result = numpy.empty(n, dtype=numpy.int64)
+            if span == 1:
+                result.fill(a)
+                return result
+            offset = numpy.uint64(a % 2**64)
+            filled = 0
+            while filled < n:
+                words = numpy.empty(n - filled, dtype=numpy.uint64)
+                self.readinto(words)
+                words >>= numpy.uint64(shift)
+                accepted = words[words <= numpy.uint64(span - 1)]
+                # Wraps around modulo 2**64, which is right for negative a
+                result[filled : filled + len(accepted)] = (accepted + offset).view(
+                    numpy.int64
+                )
+                filled += len(accepted)
+            return result
+        numbers = array.array("q")
+        while len(numbers) < n:
+            for word in self._take_int64(n - len(numbers)):
+                word >>= shift
+                if word < span:
+                    numbers.append(a + word)
+        return numbers
+
+    def _randbelow(self, n: int) -> int:
+        # Ranges that fit in a float's mantissa take one number per draw via
+        # random(). Larger ranges need getrandbits() to be unbiased.
+        if n < 2**53:
+            return self._randbelow_without_getrandbits(n)  # ty: ignore[unresolved-attribute]
+        return self._randbelow_with_getrandbits(n)  # ty: ignore[unresolved-attribute]
+
     def seed(self, *args, **kwds) -> None:
         """Method is ignored. There is no seed for the quantum vacuum.
 
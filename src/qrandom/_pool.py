@@ -0,0 +1,160 @@
+import array
+import contextlib
+import mmap
+import os
+import pathlib
+import struct
+import threading
+from collections.abc import Generator
+
+from qrandom import _source, _util
+
+# Magic, then the offsets (relative to the end of the header) of the first
+# unread byte and of the end of the data
+_HEADER = struct.Struct("<8sQQ")
+_MAGIC = b"QRNDPOOL"
+
+
+class EntropyPool:
+    """Pool of random bytes in a memory-mapped file.
+
+    Bytes are appended to the end of the file and taken from the front by
+    advancing a cursor stored in the file header. Both happen under an
+    exclusive file lock, so several processes (and runs) can share a pool and
+    no byte is ever taken twice.
+
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = pathlib.Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._thread_lock = threading.Lock()
+        self._fd = -1
+        self._open()
+        return
+
+    def _open(self) -> None:
+        self._fd = os.open(
+            self.path, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o600
+        )
+        self._pid = os.getpid()
+        with _util.locked(self._fd):
+            size = os.fstat(self._fd).st_size
+            if size == 0:
+                self._write_header(0, 0)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                magic = os.read(self._fd, len(_MAGIC))
+        if size != 0 and (size < _HEADER.size or magic != _MAGIC):
+            os.close(self._fd)
+            self._fd = -1
+            raise ValueError(f"{self.path} is not an entropy pool")
+        return
+
+    @contextlib.contextmanager
+    def _locked(self) -> Generator[None, None, None]:
+        with self._thread_lock:
+            if self._pid != os.getpid():
+                # A forked child shares the parent's open file description
+                # (and so its lock), so it needs its own
+                os.close(self._fd)
+                self._open()
+            with _util.locked(self._fd):
+                yield
+
+    @contextlib.contextmanager
+    def _map(self) -> Generator[mmap.mmap, None, None]:
+        mm = mmap.mmap(self._fd, 0)
+        try:
+            yield mm
+        finally:
+            mm.close()
+
+    def _write_header(self, start: int, end: int) -> None:
+        os.lseek(self._fd, 0, os.SEEK_SET)
+        os.write(self._fd, _HEADER.pack(_MAGIC, start, end))
+        return
+
+    def __len__(self) -> int:
+        with self._locked(), self._map() as mm:
+            _, start, end = _HEADER.unpack_from(mm)
+        return end - start
+
+    def take(self, n: int) -> bytes:
+        """Removes and returns up to n bytes from the front of the pool."""
+        with self._locked(), self._map() as mm:
+            _, start, end = _HEADER.unpack_from(mm)
+            n = min(n, end - start)
+            data = mm[_HEADER.size + start : _HEADER.size + start + n]
+            _HEADER.pack_into(mm, 0, _MAGIC, start + n, end)
+        return data
+
+    def add(self, data: bytes) -> None:
+        """Appends bytes to the end of the pool.
+
+        The file is truncated first if every byte in it has been taken.
+
+        """
+        with self._locked():
+            with self._map() as mm:
+                _, start, end = _HEADER.unpack_from(mm)
+            if start == end:
+                os.ftruncate(self._fd, _HEADER.size)
+                start = end = 0
+            os.lseek(self._fd, _HEADER.size + end, os.SEEK_SET)
+            with memoryview(data) as view:
+                written = 0
+                while written < len(view):
+                    written += os.write(self._fd, view[written:])
+            self._write_header(start, end + len(data))
+        return
+
+    def close(self) -> None:
+        """Closes the pool file."""
+        with self._thread_lock:
+            if self._fd >= 0:
+                os.close(self._fd)
+                self._fd = -1
+        return
+
+
+class PooledClient:
+    def __init__(
+        self, client: _source.Source, pool: EntropyPool, topup_batches: int = 16
+    ) -> None:
+        """Fetches batches from an entropy pool first and a client second.
+
+        When the pool runs dry, topup_batches batches (or as many as the
+        request needs, if more) are fetched from client in one go. The ones
+        not needed right away are added to the pool.
+
+        """
+        if topup_batches < 1:
+            raise ValueError("topup_batches must be > 0")
+        self.client = client
+        self.pool = pool
+        self.topup_batches = topup_batches
+        self.batch_size = client.batch_size
+        return
+
+    def fetch_int64(self) -> "array.array[int]":
+        """Gets a batch of random int64s from the pool or the client."""
+        return self.fetch_int64_batches(1)[0]
+
+    def fetch_int64_batches(self, n: int) -> "list[array.array[int]]":
+        """Gets n batches of random int64s from the pool or the client."""
+        batch_bytes = self.batch_size * 8
+        needed = n * batch_bytes
+        data = self.pool.take(needed)
+        if len(data) < needed:
+            missing = needed - len(data)
+            batches = self.client.fetch_int64_batches(
+                max(self.topup_batches, -(-missing // batch_bytes))
+            )
+            fetched = b"".join(batch.tobytes() for batch in batches)
+            data += fetched[:missing]
+            self.pool.add(fetched[missing:])
+        return [
+            array.array("Q", data[i : i + batch_bytes])
+            for i in range(0, needed, batch_bytes)
+        ]
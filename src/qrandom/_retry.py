@@ -0,0 +1,137 @@
+import collections
+import email.utils
+import random
+import threading
+import time
+
+from qrandom import _exceptions
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        attempts: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        statuses: tuple[int, ...] = (429, 500, 502, 503, 504),
+    ) -> None:
+        """When and how long to wait before retrying a failed request.
+
+        attempts is the total number of tries (1 disables retrying). Before
+        retry n (starting at 0), the client sleeps for a random time between 0
+        and min(max_backoff, backoff * 2**n) seconds ("full jitter"), or for as
+        long as the server's Retry-After header asks if that is longer.
+        Connection errors, timeouts and responses with a status in statuses
+        are retried.
+
+        """
+        if attempts < 1:
+            raise ValueError("attempts must be > 0")
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = statuses
+        return
+
+    def delay(self, retry: int, retry_after: float | None = None) -> float:
+        """Returns the number of seconds to sleep before the given retry."""
+        delay = random.uniform(0.0, min(self.max_backoff, self.backoff * 2**retry))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parses a Retry-After header (seconds or an HTTP date) into seconds."""
+    if value is None:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, date.timestamp() - time.time())
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        """Stops calling a failing API for a while.
+
+        After failure_threshold consecutive failures the circuit opens and
+        calls fail fast with CircuitOpenError. After reset_timeout seconds,
+        one trial call is let through: the circuit closes if it succeeds and
+        opens again if it fails.
+
+        """
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be > 0")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+        return
+
+    @property
+    def is_open(self) -> bool:
+        """Whether calls are currently failing fast."""
+        with self._lock:
+            return self._opened_at is not None
+
+    def before_call(self) -> None:
+        """Raises CircuitOpenError unless a call may go ahead."""
+        with self._lock:
+            if self._opened_at is None:
+                return
+            waited = time.monotonic() - self._opened_at
+            if waited < self.reset_timeout or self._trial_running:
+                raise _exceptions.CircuitOpenError(
+                    f"circuit open after {self._failures} consecutive failures; "
+                    f"retrying in {max(0.0, self.reset_timeout - waited):.1f}s"
+                )
+            self._trial_running = True
+        return
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+        return
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_running = False
+        return
+
+
+class LatencyTracker:
+    def __init__(self, size: int = 100, min_samples: int = 20) -> None:
+        """Keeps the latencies of the last size requests.
+
+        percentile() returns None until min_samples latencies are recorded.
+
+        """
+        self.min_samples = min_samples
+        self._latencies: collections.deque[float] = collections.deque(maxlen=size)
+        self._lock = threading.Lock()
+        return
+
+    def record(self, latency: float) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+        return
+
+    def percentile(self, q: float) -> float | None:
+        """Returns the q-th percentile (0 < q <= 100) of the recorded latencies."""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            latencies = sorted(self._latencies)
+        return latencies[min(len(latencies) - 1, int(len(latencies) * q / 100))]
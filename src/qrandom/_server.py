@@ -0,0 +1,218 @@
+import array
+import os
+import socket
+import socketserver
+import struct
+import threading
+from typing import TYPE_CHECKING, cast
+
+from qrandom import _exceptions
+
+if TYPE_CHECKING:
+    from qrandom._generator import QuantumRandom
+
+# Requests are the number of bytes wanted. Responses are a status and the
+# length of the payload that follows: the bytes, or a UTF-8 error message.
+_REQUEST = struct.Struct(">I")
+_RESPONSE = struct.Struct(">BI")
+_OK = 0
+_ERROR = 1
+MAX_REQUEST_SIZE = 2**24
+
+Address = str | tuple[str, int]
+
+
+def parse_address(address: str) -> Address:
+    """Parses "unix:PATH" into PATH and "HOST:PORT" into (HOST, PORT)."""
+    if address.startswith("unix:"):
+        return address[len("unix:") :]
+    host, sep, port = address.rpartition(":")
+    if not sep or not port.isdigit():
+        raise ValueError(f"invalid address {address!r} (use unix:PATH or HOST:PORT)")
+    return host, int(port)
+
+
+def _recv_exactly(sock: socket.socket, n: int) -> bytearray:
+    data = bytearray(n)
+    with memoryview(data) as view:
+        received = 0
+        while received < n:
+            with view[received:] as rest:
+                count = sock.recv_into(rest)
+            if count == 0:
+                raise ConnectionError("connection closed by entropy server")
+            received += count
+    return data
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        generator = cast(_TCPServer, self.server).generator
+        while header := self.rfile.read(_REQUEST.size):
+            if len(header) < _REQUEST.size:
+                return
+            (n,) = _REQUEST.unpack(header)
+            if n > MAX_REQUEST_SIZE:
+                self._send(_ERROR, f"request for {n} bytes exceeds the limit".encode())
+                continue
+            try:
+                data = generator.randbytes(n)
+            except Exception as e:
+                self._send(_ERROR, f"{type(e).__name__}: {e}".encode())
+                continue
+            self._send(_OK, data)
+        return
+
+    def _send(self, status: int, payload: bytes) -> None:
+        self.wfile.write(_RESPONSE.pack(status, len(payload)) + payload)
+        return
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    generator: "QuantumRandom"
+
+
+class _UnixServer(_TCPServer):
+    # Same as socketserver.ThreadingUnixStreamServer
+    address_family = getattr(socket, "AF_UNIX", -1)
+
+
+class EntropyServer:
+    def __init__(self, address: Address, generator: "QuantumRandom") -> None:
+        """Serves random bytes from generator over a Unix or TCP socket.
+
+        address is a Unix socket path or a (host, port) tuple (port 0 picks a
+        free port). Any stale socket file at the path is replaced. Use a
+        generator with prefetch=True and generous watermarks, so that it holds
+        a large pool for all the workers it serves.
+
+        """
+        self.generator = generator
+        self._server: _TCPServer
+        self._unix_path: str | None = None
+        if isinstance(address, str):
+            if os.path.exists(address):
+                os.unlink(address)
+            self._unix_path = address
+            self._server = _UnixServer(address, _Handler)  # ty: ignore[invalid-argument-type]
+        else:
+            self._server = _TCPServer(address, _Handler)
+        self._server.generator = generator
+        return
+
+    @property
+    def address(self) -> Address:
+        """The address the server is bound to."""
+        if self._unix_path is not None:
+            return self._unix_path
+        host, port = self._server.server_address[:2]
+        return str(host), int(port)
+
+    def serve_forever(self) -> None:
+        """Serves requests until shutdown() is called."""
+        self._server.serve_forever()
+        return
+
+    def shutdown(self) -> None:
+        """Stops serve_forever(), closes the socket and the generator."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._unix_path is not None and os.path.exists(self._unix_path):
+            os.unlink(self._unix_path)
+        self.generator.close()
+        return
+
+
+class SocketClient:
+    def __init__(
+        self,
+        address: Address,
+        batch_size: int = 1024,
+        timeout: float | None = None,
+    ) -> None:
+        """Client for an EntropyServer, usable in place of _api.Client.
+
+        address is the server's Unix socket path or (host, port) tuple.
+        batch_size is the number of 64-bit ints per batch. timeout (in
+        seconds) applies to connecting and to each socket operation.
+
+        """
+        self.address = address
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self._sock: socket.socket | None = None
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        return
+
+    def _connect(self) -> socket.socket:
+        if self._sock is not None and self._pid != os.getpid():
+            # Forked: the parent still owns the connection
+            self._sock = None
+        if self._sock is None:
+            if isinstance(self.address, str):
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                sock.settimeout(self.timeout)
+                try:
+                    sock.connect(self.address)
+                except OSError:
+                    sock.close()
+                    raise
+            else:
+                sock = socket.create_connection(self.address, timeout=self.timeout)
+            self._sock = sock
+            self._pid = os.getpid()
+        return self._sock
+
+    def fetch_bytes(self, n: int) -> bytes:
+        """Gets n random bytes from the server.
+
+        Raises EntropyServerError if the server could not produce them.
+
+        """
+        chunks = []
+        with self._lock:
+            for start in range(0, n, MAX_REQUEST_SIZE):
+                size = min(MAX_REQUEST_SIZE, n - start)
+                sock = self._connect()
+                try:
+                    sock.sendall(_REQUEST.pack(size))
+                    status, length = _RESPONSE.unpack(
+                        _recv_exactly(sock, _RESPONSE.size)
+                    )
+                    payload = _recv_exactly(sock, length)
+                except OSError:
+                    self._close()
+                    raise
+                if status != _OK:
+                    raise _exceptions.EntropyServerError(payload.decode())
+                chunks.append(payload)
+        return b"".join(chunks)
+
+    def fetch_int64(self) -> "array.array[int]":
+        """Gets a batch of random int64s from the server."""
+        return self.fetch_int64_batches(1)[0]
+
+    def fetch_int64_batches(self, n: int) -> "list[array.array[int]]":
+        """Gets n batches of random int64s from the server in one request."""
+        batch_bytes = self.batch_size * 8
+        data = self.fetch_bytes(n * batch_bytes)
+        return [
+            array.array("Q", data[i : i + batch_bytes])
+            for i in range(0, len(data), batch_bytes)
+        ]
+
+    def _close(self) -> None:
+        if self._sock is not None:
+            if self._pid == os.getpid():
+                self._sock.close()
+            self._sock = None
+        return
+
+    def close(self) -> None:
+        """Closes the connection. The client reconnects when next used."""
+        with self._lock:
+            self._close()
+        return
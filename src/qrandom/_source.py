@@ -0,0 +1,22 @@
+import array
+from typing import Protocol
+
+
+class Source(Protocol):
+    """Source of random 64-bit ints for QuantumRandom.
+
+    _api.Client is the reference implementation. Sources are fetched from by
+    the prefetch thread and by fetch_int64_batches' worker threads, so they
+    must be thread-safe.
+
+    """
+
+    batch_size: int
+
+    def fetch_int64(self) -> "array.array[int]":
+        """Gets a batch of batch_size random int64s."""
+        ...
+
+    def fetch_int64_batches(self, n: int) -> "list[array.array[int]]":
+        """Gets n batches of batch_size random int64s, in order."""
+        ...
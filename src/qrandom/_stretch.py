@@ -0,0 +1,75 @@
+import array
+import hashlib
+import os
+import threading
+
+from qrandom import _source
+
+
+class StretchedSource:
+    def __init__(self, source: _source.Source, stretch: int) -> None:
+        """Stretches quantum entropy with a deterministic random bit generator.
+
+        Each batch fetched from source is hashed into a 512-bit key for
+        SHAKE-256, which then generates stretch batches in counter mode
+        before the next batch is fetched to reseed it. stretch is therefore
+        the number of output bytes per quantum byte: 1 keeps a quantum byte
+        behind every output byte, larger values trade quantum purity for
+        throughput. Usable in place of the source it wraps.
+
+        The generator reseeds after a fork, so processes never share output.
+
+        """
+        if stretch < 1:
+            raise ValueError("stretch must be > 0")
+        self.source = source
+        self.batch_size = source.batch_size
+        self.stretch = stretch
+        self._key = b""
+        self._counter = 0
+        self._remaining = 0
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        return
+
+    def _reseed(self, seed: "array.array[int]") -> None:
+        self._key = hashlib.shake_256(seed.tobytes()).digest(64)
+        self._counter = 0
+        self._remaining = self.stretch
+        return
+
+    def _generate(self) -> "array.array[int]":
+        block = hashlib.shake_256(self._key + self._counter.to_bytes(8, "big"))
+        self._counter += 1
+        self._remaining -= 1
+        return array.array("Q", block.digest(self.batch_size * 8))
+
+    def fetch_int64(self) -> "array.array[int]":
+        """Gets a batch of stretched random int64s."""
+        return self.fetch_int64_batches(1)[0]
+
+    def fetch_int64_batches(self, n: int) -> "list[array.array[int]]":
+        """Gets n batches of stretched random int64s.
+
+        Fetches the quantum batches needed to reseed along the way in one
+        call to the wrapped source.
+
+        """
+        with self._lock:
+            if self._pid != os.getpid():
+                # Forked: the parent keeps generating from the same key
+                self._remaining = 0
+                self._pid = os.getpid()
+            seeds = iter([])
+            if n > self._remaining:
+                seeds = iter(
+                    self.source.fetch_int64_batches(
+                        -(-(n - self._remaining) // self.stretch)
+                    )
+                )
+            batches = []
+            for _ in range(n):
+                if self._remaining == 0:
+                    self._reseed(next(seeds))
+                batches.append(self._generate())
+        return batches
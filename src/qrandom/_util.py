@@ -1,5 +1,47 @@
+import contextlib
+import os
 import pathlib
+import sys
+from collections.abc import Generator
+from types import ModuleType
 
 
 def xdg_config_home() -> pathlib.Path:
     return pathlib.Path.home() / ".config"
+
+
+def optional_numpy() -> ModuleType | None:
+    """Returns the numpy module, or None if numpy is not installed."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+@contextlib.contextmanager
+def locked(fd: int) -> Generator[None, None, None]:
+    """Holds an exclusive lock on an open file, blocking until it is acquired.
+
+    The lock is advisory and excludes other processes (and other open file
+    descriptions in this process), not other threads using the same fd.
+
+    """
+    if sys.platform == "win32":
+        import msvcrt
+
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
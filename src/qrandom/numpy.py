@@ -2,27 +2,105 @@
 
 from typing import Any
 
+import numpy as np
 import randomgen
 from numpy import random as numpy_random
 
-from qrandom import _generator
+from qrandom import _generator, _source
 
 
 class _ANUQRNG(_generator.QuantumRandom):
-    def __init__(self, batch_size: int = 1024) -> None:
-        super().__init__(batch_size=batch_size)
+    def __init__(
+        self,
+        batch_size: int = 1024,
+        client: _source.Source | None = None,
+        stretch: int | None = None,
+    ) -> None:
+        super().__init__(batch_size=batch_size, client=client, stretch=stretch)
         return
 
     def random_raw(self, voidp: Any) -> int:
         return self._get_rand_int64()
 
+    def next_double(self, voidp: Any) -> float:
+        # Same conversion as numpy's own bit generators
+        return (self._get_rand_int64() >> 11) * (1.0 / 2**53)
 
-def quantum_rng(batch_size: int = 1024):
+    def random_raw_array(self, n: int) -> np.ndarray:
+        """Gets n 64-bit ints copied straight from the cache."""
+        out = np.empty(n, dtype=np.uint64)
+        self.readinto(out)
+        return out
+
+
+class QuantumGenerator(numpy_random.Generator):
+    """Generator that draws whole blocks from the quantum cache.
+
+    random(), bytes() and random_raw() convert blocks of cached 64-bit ints
+    with vectorised numpy operations. Other methods are inherited and draw
+    one number at a time through the RandomGen UserBitGenerator.
+
+    """
+
+    def __init__(self, qrn: _ANUQRNG) -> None:
+        super().__init__(
+            randomgen.UserBitGenerator(  # ty: ignore[invalid-argument-type]
+                qrn.random_raw, next_double=qrn.next_double
+            )
+        )
+        self._qrn = qrn
+        return
+
+    def random_raw(self, size: Any = None) -> Any:
+        """Gets raw 64-bit quantum random ints as uint64s."""
+        if size is None:
+            return self._qrn._get_rand_int64()
+        return self._qrn.random_raw_array(int(np.prod(size))).reshape(size)
+
+    def random(self, size: Any = None, dtype: Any = np.float64, out: Any = None) -> Any:
+        """Gets quantum random floats in the half-open interval [0.0, 1.0).
+
+        Float64s use 53 bits of a 64-bit int each. Float32s use 24 bits of a
+        32-bit half each, so each cached int gives two float32s.
+
+        """
+        dtype = np.dtype(dtype)
+        if dtype not in (np.float64, np.float32):
+            raise TypeError(f"Unsupported dtype {dtype!r} for random")
+        if out is not None:
+            size = out.shape
+        if size is None:
+            return dtype.type(self.random(1, dtype)[0])
+        n = int(np.prod(size))
+        if dtype == np.float64:
+            result = (self._qrn.random_raw_array(n) >> 11) * (1.0 / 2**53)
+        else:
+            halves = self._qrn.random_raw_array(-(-n // 2)).view(np.uint32)[:n]
+            result = ((halves >> 8) * (1.0 / 2**24)).astype(np.float32)
+        result = result.reshape(size)
+        if out is not None:
+            out[...] = result
+            return out
+        return result
+
+    def bytes(self, length: int) -> bytes:
+        """Gets length quantum random bytes."""
+        return self._qrn.randbytes(length)
+
+
+def quantum_rng(
+    batch_size: int = 1024,
+    client: _source.Source | None = None,
+    stretch: int | None = None,
+) -> QuantumGenerator:
     """Constructs a new Generator with a quantum BitGenerator.
 
     batch_size is the number of ANU random numbers fetched and cached
-    per API call (default is maximum allowed: 1024).
+    per API call (default is maximum allowed: 1024). client is an optional
+    ANU API client (or other source) to share with other generators (see
+    QuantumRandom). stretch turns on the quantum-seeded DRBG mode (see
+    QuantumRandom).
 
     """
-    qrn = _ANUQRNG(batch_size=batch_size)
-    return numpy_random.Generator(randomgen.UserBitGenerator(qrn.random_raw))  # ty: ignore[invalid-argument-type]
+    qrn = _ANUQRNG(batch_size=batch_size, client=client, stretch=stretch)
+    return QuantumGenerator(qrn)
@@ -1,9 +1,13 @@
+import array
 import os
+import threading
+import time
 
 import pytest
 import requests
+from requests.adapters import HTTPAdapter
 
-from qrandom import _api, _exceptions
+from qrandom import _api, _exceptions, _retry
 
 
 def test_client_url(anu_url):
@@ -17,7 +21,7 @@ def test_client_constructs_correctly():
     assert client.params == {
         "length": 1024,
         "type": "hex16",
-        "size": 4,
+        "size": 10,
     }
 
 
@@ -27,7 +31,7 @@ def test_client_constructs_correctly_passing_batch_size():
     assert client.params == {
         "length": 10,
         "type": "hex16",
-        "size": 4,
+        "size": 10,
     }
 
 
@@ -37,7 +41,7 @@ def test_client_constructs_correctly_passing_key():
     assert client.params == {
         "length": 1024,
         "type": "hex16",
-        "size": 4,
+        "size": 10,
     }
 
 
@@ -167,3 +171,183 @@ def test_find_api_key_raises_if_config_doesnt_exist_and_env_var_not_set(
     mocker.patch.dict(os.environ, environ, clear=True)
     with pytest.raises(_exceptions.APIKeyNotFoundError):
         _api.find_api_key()
+
+
+def test_client_reuses_session(mocked_responses, anu_url, test_responses):
+    for i in range(2):
+        mocked_responses.get(
+            anu_url,
+            json={"data": test_responses[i]["data"], "success": True},
+            status=200,
+        )
+    client = _api.Client("key")
+    session = client.session
+    client.fetch_hex_raw()
+    client.fetch_hex_raw()
+    assert client.session is session
+    assert len(mocked_responses.calls) == 2
+
+
+def test_client_configures_session_adapter():
+    client = _api.Client("key", pool_maxsize=4, max_retries=2)
+    adapter = client.session.get_adapter(client.url)
+    assert isinstance(adapter, HTTPAdapter)
+    assert adapter._pool_maxsize == 4
+    assert adapter.max_retries.total == 2
+
+
+def test_client_passes_timeout(mocker):
+    client = _api.Client("key", timeout=(1.0, 5.0))
+    get = mocker.patch.object(client.session, "get")
+    get.return_value.json.return_value = {"success": True, "data": []}
+    client.fetch_hex_raw()
+    assert get.call_args.kwargs["timeout"] == (1.0, 5.0)
+
+
+def test_client_close_discards_session():
+    client = _api.Client("key")
+    session = client.session
+    client.close()
+    assert client.session is not session
+
+
+def test_fetch_int64_batches_returns_batches_in_request_order(mocker):
+    calls = iter(range(8))
+    lock = threading.Lock()
+    in_flight = 0
+    max_seen = 0
+
+    def fetch_int64(self):
+        nonlocal in_flight, max_seen
+        with lock:
+            call = next(calls)
+            in_flight += 1
+            max_seen = max(max_seen, in_flight)
+        # Later requests finish first
+        time.sleep(0.01 * (8 - call))
+        with lock:
+            in_flight -= 1
+        return [call]
+
+    mocker.patch("qrandom._api.Client.fetch_int64", fetch_int64)
+    client = _api.Client("key", max_in_flight=3)
+    assert client.fetch_int64_batches(8) == [[i] for i in range(8)]
+    assert max_seen == 3
+
+
+def test_fetch_int64_batches_raises_on_failed_request(mocker, test_responses):
+    mocker.patch(
+        "qrandom._api.Client.fetch_hex_raw",
+        side_effect=[test_responses[0], requests.HTTPError("failed")],
+    )
+    client = _api.Client("key")
+    with pytest.raises(requests.HTTPError, match="failed"):
+        client.fetch_int64_batches(2)
+
+
+def test_client_raises_for_max_in_flight_out_of_bounds():
+    with pytest.raises(ValueError) as exc_info:
+        _api.Client("key", max_in_flight=0)
+    assert exc_info.value.args[0] == "max_in_flight must be > 0"
+
+
+def test_fetch_int64_decodes_whole_batch(
+    api_client_with_mocked_fetch_hex_raw, test_responses
+):
+    numbers = api_client_with_mocked_fetch_hex_raw.fetch_int64()
+    assert isinstance(numbers, array.array)
+    assert numbers.tolist() == [int(n, 16) for n in test_responses[0]["data"]]
+
+
+@pytest.fixture
+def no_sleep(mocker):
+    return mocker.patch("qrandom._api.time.sleep")
+
+
+def test_fetch_hex_raw_retries_server_errors(
+    mocked_responses, anu_url, test_responses, no_sleep
+):
+    mocked_responses.get(anu_url, status=503)
+    mocked_responses.get(anu_url, status=502)
+    mocked_responses.get(
+        anu_url,
+        json={"data": test_responses[0]["data"], "success": True},
+        status=200,
+    )
+    client = _api.Client("key")
+    assert client.fetch_hex_raw()["data"] == test_responses[0]["data"]
+    assert len(mocked_responses.calls) == 3
+    assert no_sleep.call_count == 2
+
+
+def test_fetch_hex_raw_honours_retry_after(
+    mocked_responses, anu_url, test_responses, no_sleep
+):
+    mocked_responses.get(anu_url, status=429, headers={"Retry-After": "12"})
+    mocked_responses.get(
+        anu_url,
+        json={"data": test_responses[0]["data"], "success": True},
+        status=200,
+    )
+    client = _api.Client("key")
+    client.fetch_hex_raw()
+    assert no_sleep.call_args.args[0] >= 12.0
+
+
+def test_fetch_hex_raw_raises_after_last_attempt(mocked_responses, anu_url, no_sleep):
+    for _ in range(2):
+        mocked_responses.get(anu_url, body=requests.ConnectionError("refused"))
+    client = _api.Client("key", retry=_retry.RetryPolicy(attempts=2))
+    with pytest.raises(requests.ConnectionError, match="refused"):
+        client.fetch_hex_raw()
+    assert len(mocked_responses.calls) == 2
+
+
+def test_fetch_hex_raw_does_not_retry_client_errors(
+    api_client_with_failed_api_call, mocked_responses, no_sleep
+):
+    with pytest.raises(requests.HTTPError):
+        api_client_with_failed_api_call.fetch_hex_raw()
+    assert len(mocked_responses.calls) == 1
+    assert not api_client_with_failed_api_call.circuit_breaker.is_open
+
+
+def test_fetch_hex_raw_fails_fast_when_circuit_is_open(
+    mocked_responses, anu_url, no_sleep
+):
+    mocked_responses.get(anu_url, status=500)
+    client = _api.Client(
+        "key",
+        retry=_retry.RetryPolicy(attempts=2),
+        circuit_breaker=_retry.CircuitBreaker(failure_threshold=2),
+    )
+    with pytest.raises(requests.HTTPError):
+        client.fetch_hex_raw()
+    with pytest.raises(_exceptions.CircuitOpenError):
+        client.fetch_hex_raw()
+    assert len(mocked_responses.calls) == 2
+
+
+def test_hedged_request_uses_first_answer(mocker, test_responses):
+    calls = []
+
+    def get(self):
+        calls.append(None)
+        if len(calls) == 1:
+            time.sleep(1.0)
+            return test_responses[0]
+        return test_responses[1]
+
+    mocker.patch("qrandom._api.Client._get", get)
+    client = _api.Client("key", hedge=True, hedge_after=0.01)
+    assert client.fetch_hex_raw() == test_responses[1]
+    assert len(calls) == 2
+    client.close()
+
+
+def test_hedged_request_is_not_sent_for_fast_answers(mocker, test_responses):
+    get = mocker.patch("qrandom._api.Client._get", return_value=test_responses[0])
+    client = _api.Client("key", hedge=True, hedge_after=5.0)
+    assert client.fetch_hex_raw() == test_responses[0]
+    assert get.call_count == 1
+    client.close()
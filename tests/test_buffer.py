@@ -0,0 +1,58 @@
+import array
+
+import pytest
+
+from qrandom import _buffer
+
+
+def test_buffer_is_empty_on_construction():
+    buffer = _buffer.EntropyBuffer()
+    assert len(buffer) == 0
+    assert not buffer
+    assert buffer.nbytes == 0
+
+
+def test_pop_returns_numbers_in_insertion_order():
+    buffer = _buffer.EntropyBuffer()
+    buffer.extend([1, 2])
+    buffer.extend(array.array("Q", [3]))
+    assert [buffer.pop() for _ in range(3)] == [1, 2, 3]
+    assert len(buffer) == 0
+
+
+def test_pop_raises_when_empty():
+    buffer = _buffer.EntropyBuffer()
+    with pytest.raises(IndexError) as exc_info:
+        buffer.pop()
+    assert exc_info.value.args[0] == "pop from empty buffer"
+
+
+def test_take_returns_oldest_numbers():
+    buffer = _buffer.EntropyBuffer()
+    buffer.extend(range(10))
+    assert buffer.take(4) == array.array("Q", [0, 1, 2, 3])
+    assert list(buffer) == list(range(4, 10))
+    with pytest.raises(IndexError) as exc_info:
+        buffer.take(7)
+    assert exc_info.value.args[0] == "not enough numbers in buffer"
+
+
+def test_extend_discards_consumed_numbers():
+    buffer = _buffer.EntropyBuffer()
+    buffer.extend(range(4))
+    buffer.take(3)
+    buffer.extend([2**64 - 1])
+    assert list(buffer) == [3, 2**64 - 1]
+    assert buffer.nbytes == 16
+
+
+def test_readinto_copies_bytes_and_removes_whole_numbers():
+    buffer = _buffer.EntropyBuffer()
+    numbers = array.array("Q", [1, 2, 3])
+    buffer.extend(numbers)
+    data = bytearray(12)
+    assert buffer.readinto(memoryview(data)) == 12
+    assert data == numbers.tobytes()[:12]
+    assert list(buffer) == [3]
+    buffer.extend([4])
+    assert list(buffer) == [3, 4]
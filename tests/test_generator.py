@@ -1,6 +1,8 @@
+import array
+
 import pytest
 
-from qrandom import _generator
+from qrandom import _api, _generator
 
 
 def test_notimplemented_raises_on_call(quantum_random_with_no_api_calls):
@@ -66,11 +68,12 @@ def test_random_returns_in_correct_range(
 def test_quantum_random_constructs_correctly_by_default():
     quantum_random = _generator.QuantumRandom()
     assert not quantum_random._rand_int64
+    assert isinstance(quantum_random._api_client, _api.Client)
     assert quantum_random._api_client.key == "key"
     assert quantum_random._api_client.params == {
         "length": 1024,
         "type": "hex16",
-        "size": 4,
+        "size": 10,
     }
 
 
@@ -81,3 +84,177 @@ def test_quantum_random_raises_for_batch_size_out_of_bounds():
     with pytest.raises(ValueError) as exc_info:
         _generator.QuantumRandom(batch_size=1025)
     assert exc_info.value.args[0] == "batch_size must be > 0 and up to 1024"
+
+
+def test_prefetch_fills_up_to_high_watermark(mocker, test_responses):
+    mocker.patch(
+        "qrandom._api.Client.fetch_hex_raw",
+        side_effect=test_responses,
+    )
+    quantum_random = _generator.QuantumRandom(
+        prefetch=True, low_watermark=1024, high_watermark=3072
+    )
+    with quantum_random._cond:
+        quantum_random._cond.wait_for(lambda: len(quantum_random._rand_int64) >= 3072)
+    assert len(quantum_random._rand_int64) == 3072
+    assert 0.0 <= quantum_random.random() < 1.0
+    quantum_random.close()
+    assert len(quantum_random._rand_int64) == 3071
+    assert quantum_random._prefetch_thread is None
+
+
+def test_prefetch_refills_below_low_watermark(mocker, test_responses):
+    fetch = mocker.patch(
+        "qrandom._api.Client.fetch_hex_raw",
+        side_effect=test_responses,
+    )
+    quantum_random = _generator.QuantumRandom(
+        prefetch=True, low_watermark=1024, high_watermark=2048
+    )
+    for _ in range(1024 * 3):
+        quantum_random.random()
+    quantum_random.close()
+    assert fetch.call_count >= 3
+
+
+def test_prefetch_raises_fetch_error_when_empty(mocker):
+    mocker.patch(
+        "qrandom._api.Client.fetch_hex_raw",
+        side_effect=RuntimeError("fetch failed"),
+    )
+    quantum_random = _generator.QuantumRandom(prefetch=True)
+    with pytest.raises(RuntimeError, match="fetch failed"):
+        quantum_random.random()
+    quantum_random.close()
+
+
+def test_close_without_prefetch_is_a_no_op(quantum_random_with_mocked_fetch_hex_raw):
+    quantum_random_with_mocked_fetch_hex_raw.close()
+    assert 0.0 <= quantum_random_with_mocked_fetch_hex_raw.random() < 1.0
+
+
+def test_quantum_random_raises_for_bad_watermarks():
+    with pytest.raises(ValueError) as exc_info:
+        _generator.QuantumRandom(low_watermark=10, high_watermark=10)
+    assert (
+        exc_info.value.args[0]
+        == "watermarks must satisfy 0 < low_watermark < high_watermark"
+    )
+
+
+def test_quantum_randoms_share_client(mocker, test_responses):
+    fetch = mocker.patch(
+        "qrandom._api.Client.fetch_hex_raw",
+        side_effect=test_responses,
+    )
+    client = _api.Client("key", batch_size=1024)
+    first = _generator.QuantumRandom(client=client)
+    second = _generator.QuantumRandom(client=client)
+    assert first._api_client is second._api_client
+    first.random()
+    second.random()
+    assert fetch.call_count == 2
+
+
+def test_fill_merges_concurrent_batches_in_order(mocker, test_responses):
+    mocker.patch(
+        "qrandom._api.Client.fetch_hex_raw",
+        side_effect=[test_responses[i] for i in range(5)],
+    )
+    quantum_random = _generator.QuantumRandom()
+    quantum_random.fill(5)
+    assert len(quantum_random._rand_int64) == 1024 * 5
+    assert sorted(quantum_random._rand_int64) == sorted(
+        int(number, 16) for i in range(5) for number in test_responses[i]["data"]
+    )
+
+
+def test_getrandbits_returns_k_bits(quantum_random_with_mocked_fetch_hex_raw):
+    quantum_random = quantum_random_with_mocked_fetch_hex_raw
+    assert quantum_random.getrandbits(0) == 0
+    for k in (1, 7, 64, 65, 200):
+        assert 0 <= quantum_random.getrandbits(k) < 2**k
+    assert len(quantum_random._rand_int64) == 1024 - 1 - 1 - 1 - 2 - 4
+
+
+def test_getrandbits_raises_for_negative_k(quantum_random_with_no_api_calls):
+    with pytest.raises(ValueError) as exc_info:
+        quantum_random_with_no_api_calls.getrandbits(-1)
+    assert exc_info.value.args[0] == "number of bits must be non-negative"
+
+
+def test_randbytes_comes_from_fetched_numbers(
+    quantum_random_with_mocked_fetch_hex_raw, test_responses
+):
+    data = quantum_random_with_mocked_fetch_hex_raw.randbytes(20)
+    expected = array.array("Q", [int(n, 16) for n in test_responses[0]["data"][:3]])
+    assert data == expected.tobytes()[:20]
+    assert len(quantum_random_with_mocked_fetch_hex_raw._rand_int64) == 1024 - 3
+
+
+def test_readinto_fills_buffer_across_batches(
+    quantum_random_with_mocked_fetch_hex_raw_twice,
+):
+    data = bytearray(1024 * 8 + 4)
+    written = quantum_random_with_mocked_fetch_hex_raw_twice.readinto(data)
+    assert written == len(data)
+    assert data[-4:] != bytes(4)
+    assert len(quantum_random_with_mocked_fetch_hex_raw_twice._rand_int64) == 1023
+
+
+def test_randrange_covers_large_ranges(quantum_random_with_mocked_fetch_hex_raw):
+    number = quantum_random_with_mocked_fetch_hex_raw.randrange(2**200)
+    assert 0 <= number < 2**200
+
+
+@pytest.fixture(params=["numpy", "stdlib"])
+def bulk_backend(request, mocker):
+    if request.param == "stdlib":
+        mocker.patch("qrandom._util.optional_numpy", return_value=None)
+    return request.param
+
+
+def test_random_array_converts_cached_numbers(
+    bulk_backend, quantum_random_with_mocked_fetch_hex_raw, test_responses
+):
+    numbers = quantum_random_with_mocked_fetch_hex_raw.random_array(5)
+    expected = [(int(n, 16) >> 11) / 2**53 for n in test_responses[0]["data"][:5]]
+    assert numbers.tolist() == expected
+    assert len(quantum_random_with_mocked_fetch_hex_raw._rand_int64) == 1024 - 5
+
+
+def test_uniform_array_returns_in_range(
+    bulk_backend, quantum_random_with_mocked_fetch_hex_raw
+):
+    numbers = quantum_random_with_mocked_fetch_hex_raw.uniform_array(-2.0, 3.0, 100)
+    assert len(numbers) == 100
+    assert all(-2.0 <= x <= 3.0 for x in numbers)
+
+
+@pytest.mark.parametrize(
+    "a, b", [(0, 9), (-5, 5), (7, 7), (-(2**63), 2**63 - 1), (2**62, 2**63 - 1)]
+)
+def test_randint_array_returns_in_range(
+    bulk_backend, quantum_random_with_mocked_fetch_hex_raw_for_all_data, a, b
+):
+    numbers = quantum_random_with_mocked_fetch_hex_raw_for_all_data.randint_array(
+        a, b, 500
+    )
+    assert len(numbers) == 500
+    assert all(a <= x <= b for x in numbers.tolist())
+
+
+def test_randint_array_covers_small_range(
+    bulk_backend, quantum_random_with_mocked_fetch_hex_raw
+):
+    numbers = quantum_random_with_mocked_fetch_hex_raw.randint_array(1, 6, 600)
+    assert set(numbers.tolist()) == {1, 2, 3, 4, 5, 6}
+
+
+def test_bulk_methods_raise_for_bad_arguments(quantum_random_with_no_api_calls):
+    with pytest.raises(ValueError) as exc_info:
+        quantum_random_with_no_api_calls.random_array(-1)
+    assert exc_info.value.args[0] == "n must be non-negative"
+    with pytest.raises(ValueError) as exc_info:
+        quantum_random_with_no_api_calls.randint_array(0, 2**63, 1)
+    assert exc_info.value.args[0] == "a and b must satisfy -2**63 <= a <= b < 2**63"
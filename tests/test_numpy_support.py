@@ -1,3 +1,5 @@
+import numpy as np
+
 from qrandom import numpy
 
 
@@ -9,3 +11,71 @@ def test_numpy_support(mocker, test_responses):
     numbers = numpy.quantum_rng().random((3, 3))
     assert ((numbers >= 0.0) & (numbers < 1.0)).all()
     return
+
+
+def test_random_converts_cached_blocks(mocker, test_responses):
+    mocker.patch(
+        "qrandom._api.Client.fetch_hex_raw",
+        side_effect=test_responses,
+    )
+    qrng = numpy.quantum_rng()
+    expected = [(int(n, 16) >> 11) / 2**53 for n in test_responses[0]["data"][:6]]
+    numbers = qrng.random((2, 3))
+    assert numbers.shape == (2, 3)
+    assert numbers.ravel().tolist() == expected
+    assert len(qrng._qrn._rand_int64) == 1024 - 6
+
+
+def test_random_float32_uses_half_a_number_each(mocker, test_responses):
+    mocker.patch(
+        "qrandom._api.Client.fetch_hex_raw",
+        side_effect=test_responses,
+    )
+    qrng = numpy.quantum_rng()
+    numbers = qrng.random(5, dtype=np.float32)
+    assert numbers.dtype == np.float32
+    assert ((numbers >= 0.0) & (numbers < 1.0)).all()
+    assert len(qrng._qrn._rand_int64) == 1024 - 3
+
+
+def test_random_fills_out(mocker, test_responses):
+    mocker.patch(
+        "qrandom._api.Client.fetch_hex_raw",
+        side_effect=test_responses,
+    )
+    out = np.empty(4)
+    assert numpy.quantum_rng().random(out=out) is out
+    assert ((out >= 0.0) & (out < 1.0)).all()
+
+
+def test_random_raw_and_bytes(mocker, test_responses):
+    mocker.patch(
+        "qrandom._api.Client.fetch_hex_raw",
+        side_effect=test_responses,
+    )
+    qrng = numpy.quantum_rng()
+    numbers = [int(n, 16) for n in test_responses[0]["data"]]
+    assert qrng.random_raw() == numbers[0]
+    assert qrng.random_raw(2).tolist() == numbers[1:3]
+    assert len(qrng.bytes(16)) == 16
+    assert isinstance(qrng.random(), float)
+
+
+def test_other_distributions_fall_back_to_bit_generator(mocker, test_responses):
+    mocker.patch(
+        "qrandom._api.Client.fetch_hex_raw",
+        side_effect=test_responses,
+    )
+    qrng = numpy.quantum_rng()
+    assert qrng.standard_normal(10).shape == (10,)
+    assert ((qrng.integers(0, 10, 100) >= 0) & (qrng.integers(0, 10, 100) < 10)).all()
+
+
+def test_quantum_rng_with_stretch(mocker, test_responses):
+    fetch_hex_raw = mocker.patch(
+        "qrandom._api.Client.fetch_hex_raw",
+        return_value=test_responses[0],
+    )
+    numbers = numpy.quantum_rng(stretch=4).random(4 * 1024)
+    assert fetch_hex_raw.call_count == 1
+    assert ((numbers >= 0.0) & (numbers < 1.0)).all()
@@ -0,0 +1,124 @@
+import array
+import multiprocessing
+
+import pytest
+
+from qrandom import _api, _generator, _pool
+
+
+def test_pool_is_empty_on_creation(tmp_path):
+    pool = _pool.EntropyPool(tmp_path / "pool.bin")
+    assert len(pool) == 0
+    assert pool.take(8) == b""
+    pool.close()
+
+
+def test_take_returns_added_bytes_once(tmp_path):
+    pool = _pool.EntropyPool(tmp_path / "pool.bin")
+    pool.add(b"abcdef")
+    pool.add(b"gh")
+    assert len(pool) == 8
+    assert pool.take(3) == b"abc"
+    assert pool.take(10) == b"defgh"
+    assert pool.take(1) == b""
+    pool.close()
+
+
+def test_pool_persists_across_instances(tmp_path):
+    path = tmp_path / "pool.bin"
+    first = _pool.EntropyPool(path)
+    first.add(b"abcdef")
+    assert first.take(2) == b"ab"
+    second = _pool.EntropyPool(path)
+    assert second.take(2) == b"cd"
+    assert first.take(10) == b"ef"
+    first.close()
+    second.close()
+
+
+def test_add_truncates_drained_pool(tmp_path):
+    path = tmp_path / "pool.bin"
+    pool = _pool.EntropyPool(path)
+    pool.add(b"abcdef")
+    pool.take(6)
+    pool.add(b"gh")
+    assert path.stat().st_size == _pool._HEADER.size + 2
+    assert pool.take(2) == b"gh"
+    pool.close()
+
+
+def test_pool_raises_for_other_files(tmp_path):
+    path = tmp_path / "not-a-pool.bin"
+    path.write_bytes(b"x" * 64)
+    with pytest.raises(ValueError) as exc_info:
+        _pool.EntropyPool(path)
+    assert exc_info.value.args[0] == f"{path} is not an entropy pool"
+
+
+def _take_all(path, queue):
+    pool = _pool.EntropyPool(path)
+    taken = []
+    while chunk := pool.take(3):
+        taken.append(chunk)
+    queue.put(b"".join(taken))
+
+
+def test_processes_never_take_the_same_bytes(tmp_path):
+    path = tmp_path / "pool.bin"
+    pool = _pool.EntropyPool(path)
+    data = bytes(range(256)) * 16
+    pool.add(data)
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    workers = [context.Process(target=_take_all, args=(path, queue)) for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    taken = [queue.get(timeout=30) for _ in workers]
+    for worker in workers:
+        worker.join()
+    assert sum(len(chunk) for chunk in taken) == len(data)
+    pool.close()
+
+
+def test_pooled_client_tops_up_pool(mocker, tmp_path, test_responses):
+    fetch = mocker.patch(
+        "qrandom._api.Client.fetch_hex_raw",
+        side_effect=test_responses,
+    )
+    pool = _pool.EntropyPool(tmp_path / "pool.bin")
+    client = _pool.PooledClient(
+        _api.Client("key", max_in_flight=1), pool, topup_batches=4
+    )
+    first = client.fetch_int64()
+    assert fetch.call_count == 4
+    assert len(pool) == 3 * 1024 * 8
+    assert first == array.array("Q", [int(n, 16) for n in test_responses[0]["data"]])
+    assert client.fetch_int64_batches(3)[2] == array.array(
+        "Q", [int(n, 16) for n in test_responses[3]["data"]]
+    )
+    assert fetch.call_count == 4
+    assert len(pool) == 0
+    client.fetch_int64_batches(5)
+    assert fetch.call_count == 9
+    assert len(pool) == 0
+    pool.close()
+
+
+def test_pooled_client_raises_for_bad_topup(tmp_path):
+    pool = _pool.EntropyPool(tmp_path / "pool.bin")
+    with pytest.raises(ValueError) as exc_info:
+        _pool.PooledClient(_api.Client("key"), pool, topup_batches=0)
+    assert exc_info.value.args[0] == "topup_batches must be > 0"
+    pool.close()
+
+
+def test_quantum_random_draws_from_cache_first(mocker, tmp_path):
+    fetch = mocker.patch("qrandom._api.Client.fetch_hex_raw")
+    path = tmp_path / "pool.bin"
+    pool = _pool.EntropyPool(path)
+    pool.add(array.array("Q", range(2048)).tobytes())
+    quantum_random = _generator.QuantumRandom(cache=path)
+    assert [quantum_random._get_rand_int64() for _ in range(3)] == [0, 1, 2]
+    assert len(pool) == 1024 * 8
+    fetch.assert_not_called()
+    pool.close()
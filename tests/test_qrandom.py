@@ -1,5 +1,70 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
 import qrandom
 
+# Generous upper bound on the cumulative import time of qrandom (as reported by
+# python -X importtime) so that regressions like importing requests show up
+IMPORT_TIME_BUDGET_US = 250_000
+
+
+@pytest.fixture
+def env_without_api_key(tmp_path):
+    env = {
+        name: value for name, value in os.environ.items() if name != "QRANDOM_API_KEY"
+    }
+    env["QRANDOM_CONFIG_DIR"] = str(tmp_path)
+    return env
+
 
 def test_all_is_subset_of_everything_in_module():
     assert set(qrandom.__all__).issubset(set(dir(qrandom)))
+
+
+def test_import_does_not_need_api_key_or_load_http_stack(env_without_api_key):
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, qrandom; "
+            "print(sorted({'requests', 'numpy'} & set(sys.modules)), qrandom._inst)",
+        ],
+        env=env_without_api_key,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout == "[] None\n"
+
+
+def test_import_time_is_within_budget(env_without_api_key):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import qrandom"],
+        env=env_without_api_key,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative = [
+        int(line.split("|")[1])
+        for line in result.stderr.splitlines()
+        if line.split("|")[-1].strip() == "qrandom"
+    ]
+    assert cumulative and cumulative[0] < IMPORT_TIME_BUDGET_US
+
+
+def test_module_functions_create_instance_on_first_use(mocker, test_responses):
+    mocker.patch("qrandom._inst", None)
+    mocker.patch(
+        "qrandom._api.Client.fetch_hex_raw",
+        return_value=test_responses[0],
+    )
+    assert 0.0 <= qrandom.random() < 1.0
+    assert isinstance(qrandom._inst, qrandom.QuantumRandom)
+    instance = qrandom._inst
+    qrandom.randint(1, 6)
+    assert qrandom._inst is instance
+    assert len(instance._rand_int64) == 1022
@@ -0,0 +1,74 @@
+import email.utils
+import time
+
+import pytest
+
+from qrandom import _exceptions, _retry
+
+
+def test_delay_is_jittered_and_capped():
+    policy = _retry.RetryPolicy(backoff=1.0, max_backoff=3.0)
+    for retry in range(5):
+        assert 0.0 <= policy.delay(retry) <= min(3.0, 2.0**retry)
+
+
+def test_delay_honours_retry_after():
+    policy = _retry.RetryPolicy(backoff=0.0)
+    assert policy.delay(0, retry_after=7.0) == 7.0
+
+
+def test_retry_policy_raises_for_bad_attempts():
+    with pytest.raises(ValueError) as exc_info:
+        _retry.RetryPolicy(attempts=0)
+    assert exc_info.value.args[0] == "attempts must be > 0"
+
+
+def test_parse_retry_after():
+    assert _retry.parse_retry_after(None) is None
+    assert _retry.parse_retry_after("120") == 120.0
+    assert _retry.parse_retry_after("soon") is None
+    date = email.utils.formatdate(time.time() + 60, usegmt=True)
+    assert 55.0 < (_retry.parse_retry_after(date) or 0.0) <= 60.0
+
+
+def test_circuit_opens_after_threshold_and_closes_after_trial(mocker):
+    monotonic = mocker.patch("qrandom._retry.time.monotonic", return_value=100.0)
+    breaker = _retry.CircuitBreaker(failure_threshold=2, reset_timeout=10.0)
+    breaker.before_call()
+    breaker.record_failure()
+    assert not breaker.is_open
+    breaker.record_failure()
+    assert breaker.is_open
+    with pytest.raises(_exceptions.CircuitOpenError):
+        breaker.before_call()
+    monotonic.return_value = 111.0
+    breaker.before_call()
+    with pytest.raises(_exceptions.CircuitOpenError):
+        # Only one trial call at a time
+        breaker.before_call()
+    breaker.record_success()
+    assert not breaker.is_open
+    breaker.before_call()
+
+
+def test_failed_trial_reopens_circuit(mocker):
+    monotonic = mocker.patch("qrandom._retry.time.monotonic", return_value=100.0)
+    breaker = _retry.CircuitBreaker(failure_threshold=3, reset_timeout=10.0)
+    for _ in range(3):
+        breaker.record_failure()
+    monotonic.return_value = 111.0
+    breaker.before_call()
+    breaker.record_failure()
+    with pytest.raises(_exceptions.CircuitOpenError):
+        breaker.before_call()
+
+
+def test_latency_tracker_percentile():
+    tracker = _retry.LatencyTracker(size=100, min_samples=10)
+    for latency in range(9):
+        tracker.record(float(latency))
+    assert tracker.percentile(95) is None
+    for latency in range(9, 100):
+        tracker.record(float(latency))
+    assert tracker.percentile(95) == 95.0
+    assert tracker.percentile(100) == 99.0
@@ -0,0 +1,100 @@
+import array
+import os
+import threading
+
+import pytest
+from typer.testing import CliRunner
+
+from qrandom import _api, _cli, _exceptions, _generator, _server
+
+
+@pytest.fixture
+def unix_address(tmp_path):
+    return str(tmp_path / "qrandom.sock")
+
+
+@pytest.fixture
+def start_server(mocker, test_responses):
+    servers = []
+
+    def start(address, side_effect=None):
+        mocker.patch(
+            "qrandom._api.Client.fetch_hex_raw",
+            side_effect=side_effect or test_responses,
+        )
+        generator = _generator.QuantumRandom(client=_api.Client("key", max_in_flight=1))
+        server = _server.EntropyServer(address, generator)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+
+
+def test_parse_address():
+    assert _server.parse_address("unix:/run/qrandom.sock") == "/run/qrandom.sock"
+    assert _server.parse_address("localhost:8765") == ("localhost", 8765)
+    with pytest.raises(ValueError) as exc_info:
+        _server.parse_address("localhost")
+    assert exc_info.value.args[0] == (
+        "invalid address 'localhost' (use unix:PATH or HOST:PORT)"
+    )
+
+
+def test_socket_client_gets_bytes_over_unix_socket(
+    start_server, unix_address, test_responses
+):
+    start_server(unix_address)
+    client = _server.SocketClient(unix_address, batch_size=4)
+    numbers = [int(n, 16) for n in test_responses[0]["data"]]
+    assert client.fetch_int64() == array.array("Q", numbers[:4])
+    assert client.fetch_int64_batches(2) == [
+        array.array("Q", numbers[4:8]),
+        array.array("Q", numbers[8:12]),
+    ]
+    assert len(client.fetch_bytes(10)) == 10
+    client.close()
+
+
+def test_socket_client_gets_bytes_over_tcp(start_server):
+    server = start_server(("127.0.0.1", 0))
+    client = _server.SocketClient(server.address)
+    assert len(client.fetch_int64()) == 1024
+    client.close()
+
+
+def test_socket_client_raises_server_errors(start_server, unix_address):
+    start_server(unix_address, side_effect=RuntimeError("quota exceeded"))
+    client = _server.SocketClient(unix_address)
+    with pytest.raises(_exceptions.EntropyServerError) as exc_info:
+        client.fetch_int64()
+    assert exc_info.value.args[0] == "RuntimeError: quota exceeded"
+    client.close()
+
+
+def test_quantum_random_uses_server_from_env(
+    mocker, start_server, unix_address, test_responses
+):
+    start_server(unix_address)
+    mocker.patch.dict("os.environ", {"QRANDOM_SERVER": f"unix:{unix_address}"})
+    quantum_random = _generator.QuantumRandom(batch_size=8)
+    assert isinstance(quantum_random._api_client, _server.SocketClient)
+    assert quantum_random.getrandbits(64) == int(test_responses[0]["data"][0], 16)
+    assert len(quantum_random._rand_int64) == 7
+
+
+def test_shutdown_removes_socket_file(unix_address):
+    generator = _generator.QuantumRandom()
+    server = _server.EntropyServer(unix_address, generator)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    server.shutdown()
+    thread.join()
+    assert not os.path.exists(unix_address)
+
+
+def test_serve_command_requires_address():
+    result = CliRunner().invoke(_cli.cli, ["serve"])
+    assert result.exit_code == 2
@@ -0,0 +1,75 @@
+import array
+
+import pytest
+
+from qrandom import _generator, _stretch
+
+
+class FakeSource:
+    def __init__(self, batch_size=4):
+        self.batch_size = batch_size
+        self.calls = []
+        self._next = 0
+
+    def fetch_int64(self):
+        return self.fetch_int64_batches(1)[0]
+
+    def fetch_int64_batches(self, n):
+        self.calls.append(n)
+        batches = []
+        for _ in range(n):
+            batches.append(
+                array.array("Q", range(self._next, self._next + self.batch_size))
+            )
+            self._next += self.batch_size
+        return batches
+
+
+def test_stretch_must_be_positive():
+    with pytest.raises(ValueError) as exc_info:
+        _stretch.StretchedSource(FakeSource(), 0)
+    assert exc_info.value.args[0] == "stretch must be > 0"
+
+
+def test_each_quantum_batch_seeds_stretch_batches():
+    source = FakeSource()
+    stretched = _stretch.StretchedSource(source, 3)
+    batches = stretched.fetch_int64_batches(7)
+    assert source.calls == [3]
+    assert [len(batch) for batch in batches] == [4] * 7
+    assert len({batch.tobytes() for batch in batches}) == 7
+    stretched.fetch_int64_batches(2)
+    assert source.calls == [3]
+    stretched.fetch_int64_batches(1)
+    assert source.calls == [3, 1]
+
+
+def test_output_is_determined_by_the_quantum_seed():
+    first = _stretch.StretchedSource(FakeSource(), 2).fetch_int64_batches(4)
+    second = _stretch.StretchedSource(FakeSource(), 2).fetch_int64_batches(4)
+    assert first == second
+    # Not the quantum numbers themselves
+    assert first[0] != array.array("Q", range(4))
+
+
+def test_reseeds_after_fork(mocker):
+    source = FakeSource()
+    stretched = _stretch.StretchedSource(source, 10)
+    stretched.fetch_int64()
+    mocker.patch("os.getpid", return_value=-1)
+    stretched.fetch_int64()
+    assert source.calls == [1, 1]
+
+
+def test_quantum_random_with_stretch(mocker, test_responses):
+    fetch_hex_raw = mocker.patch(
+        "qrandom._api.Client.fetch_hex_raw",
+        return_value=test_responses[0],
+    )
+    qr = _generator.QuantumRandom(stretch=5)
+    assert isinstance(qr._source, _stretch.StretchedSource)
+    numbers = [qr.random() for _ in range(5 * 1024)]
+    assert fetch_hex_raw.call_count == 1
+    assert all(0 <= x < 1 for x in numbers)
+    qr.random()
+    assert fetch_hex_raw.call_count == 2